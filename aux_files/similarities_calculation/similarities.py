@@ -28,9 +28,9 @@ def calculate_sims(logger: logging.Logger,
   """
   t_start = time.perf_counter()
   TMfolder = pathlib.Path(tm_model_dir)
-  thetas = sparse.load_npz(TMfolder.joinpath('thetas.npz'))
+  thetas = sparse.load_npz(TMfolder.joinpath('thetas.npz')).tocsr()
   logger.info(f"Shape of thetas: {np.shape(thetas)} ")
-  thetas_sqrt = np.sqrt(thetas)
+  thetas_sqrt = thetas.sqrt()
   thetas_col = thetas_sqrt.T
   
   logger.info(f"Topn: {topn}")
@@ -12,7 +12,9 @@ import pathlib
 def calculate_sims(logger: logging.Logger,
                    tm_model_dir:str,
                    topn:int=300,
-                   lb:float=0.6):
+                   lb:float=0.6,
+                   block_size:int=4096,
+                   density_thr:float=0.1):
   """Given the path to a TMmodel, it calculates the similarities between documents and saves them in a sparse matrix.
 
   Parameters
@@ -25,16 +27,37 @@ def calculate_sims(logger: logging.Logger,
       Number of top similar documents to be saved. The default is 300.
   lb : float, optional
       Lower bound for the similarity. The default is 0.6.
+  block_size : int, optional
+      Number of rows of the similarity matrix computed at once when thetas is dense. The default is 4096.
+  density_thr : float, optional
+      Density of thetas (fraction of nonzero entries) below which the sparse path is used. The default is 0.1.
   """
   t_start = time.perf_counter()
   TMfolder = pathlib.Path(tm_model_dir)
-  thetas = sparse.load_npz(TMfolder.joinpath('thetas.npz')).toarray()
+  thetas = sparse.load_npz(TMfolder.joinpath('thetas.npz')).tocsr()
   logger.info(f"Shape of thetas: {np.shape(thetas)} ")
-  
-  sqrtThetas = np.sqrt(thetas)
-  sims = sqrtThetas.dot(sqrtThetas.T)
-  sims_sparse = sparse.csr_matrix(sims, copy=True)
-  
+  density = thetas.nnz / max(1, np.prod(thetas.shape))
+  logger.info(f"Density of thetas: {density}")
+
+  if density < density_thr:
+    # Sparse thetas: sparse GEMM keeping only the topn similarities above lb per document
+    thetas_sqrt = thetas.sqrt()
+    sims_sparse = awesome_cossim_topn(thetas_sqrt, thetas_sqrt.T.tocsr(), topn, lb)
+  else:
+    # Dense thetas: square root in place and GEMM by blocks of rows, so that only one block of the dense similarity matrix is in memory at a time
+    thetas = thetas.toarray()
+    np.sqrt(thetas, out=thetas)
+    blocks = []
+    for start in range(0, thetas.shape[0], block_size):
+      sims = thetas[start:start + block_size] @ thetas.T
+      # Keep only the topn similarities above lb per document, as awesome_cossim_topn does in the sparse path
+      sims[sims <= lb] = 0
+      if topn < sims.shape[1]:
+        drop = np.argpartition(sims, -topn, axis=1)[:, :-topn]
+        np.put_along_axis(sims, drop, 0, axis=1)
+      blocks.append(sparse.csr_matrix(sims))
+    sims_sparse = sparse.vstack(blocks, format='csr')
+
   sparse.save_npz(TMfolder.joinpath('distances.npz'), sims_sparse)
 
   t_end = time.perf_counter()
@@ -51,6 +74,10 @@ def main():
                         help="Number of top similar documents to be saved.")
     parser.add_argument('--lb', type=float, default=0.6,
                         help="Lower bound for the similarity.")
+    parser.add_argument('--block_size', type=int, default=4096,
+                        help="Number of rows computed at once when thetas is dense.")
+    parser.add_argument('--density_thr', type=float, default=0.1,
+                        help="Density of thetas below which the sparse path is used.")
     
     ################### LOGGER #################
     logger = logging.getLogger()
@@ -63,7 +90,7 @@ def main():
     args = parser.parse_args()
     
     # Calculate similarities
-    calculate_sims(logger, args.path_tmmodel, args.topn, args.lb)
+    calculate_sims(logger, args.path_tmmodel, args.topn, args.lb, args.block_size, args.density_thr)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
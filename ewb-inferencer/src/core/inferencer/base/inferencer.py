@@ -97,12 +97,7 @@ class Inferencer(object):
                 String representation of the document's topic proportions.
             """
             vector = sum_up_to(vector, max_sum)
-            rpr = ""
-            for idx, val in enumerate(vector):
-                if val != 0:
-                    rpr += "t" + str(idx) + "|" + str(val) + " "
-            rpr = rpr.rstrip()
-            return rpr
+            return " ".join(f"t{idx}|{val}" for idx, val in enumerate(vector.tolist()) if val != 0)
 
         if thetas32.ndim == 2:
             doc_tpc_rpr = [get_doc_str_rpr(thetas32[row, :], max_sum)
@@ -136,6 +131,13 @@ class Inferencer(object):
         model_for_infer_path = Path(self._inferConfig["model_for_infer_path"])
         infer_path = Path(self._inferConfig["infer_path"])
 
+        if thetas32.ndim not in (1, 2):
+            self._logger.error(
+                f"-- -- Thetas32 has wrong number of dimensions when applying model edition actions")
+            raise ValueError(
+                f"Thetas32 must have 1 or 2 dimensions, got {thetas32.ndim}")
+        is_2d = thetas32.ndim == 2
+
         model_edits = model_for_infer_path.joinpath('TMmodel/edits.txt')
         self._logger.info(
             f'-- Model edits: {model_edits.as_posix()}')
@@ -146,46 +148,34 @@ class Inferencer(object):
                     line_els = line.strip().split()
                     if line_els[0] == 's':
                         idx = [int(el) for el in line_els[1:]]
-                        if thetas32.ndim == 2:
+                        if is_2d:
                             self._logger.info(f'-- Thetas dim 2 before')
                             self._logger.info(f'-- Thetas32: {thetas32}')
                             thetas32 = thetas32[idx, :]
                             self._logger.info(f'-- Thetas dim 2 after')
-                        elif thetas32.ndim == 1:
-                            thetas32 = thetas32[idx]
                         else:
-                            self._logger.error(
-                                f"-- -- Thetas32 has wrong number of dimensions when applying model edition actions (s)")
-                            sys.exit(1)
+                            thetas32 = thetas32[idx]
                     elif line_els[0] == 'd':
                         tpc = int(line_els[1])
-                        ntopics = thetas32.shape[1]
+                        ntopics = thetas32.shape[-1]
                         tpc_keep = [k for k in range(ntopics) if k != tpc]
-                        if thetas32.ndim == 2:
+                        if is_2d:
                             thetas32 = thetas32[:, tpc_keep]
-                        elif thetas32.ndim == 1:
-                            thetas32 = thetas32[tpc_keep]
                         else:
-                            self._logger.error(
-                                f"-- -- Thetas32 has wrong number of dimensions when applying model edition actions (s)")
-                            sys.exit(1)
+                            thetas32 = thetas32[tpc_keep]
                     elif line_els[0] == 'f':
                         tpcs = [int(el) for el in line_els[1:]]
-                        if thetas32.ndim == 2:
+                        if is_2d:
                             thet = np.sum(thetas32[:, tpcs], axis=1)
                             thetas32[:, tpcs[0]] = thet
                             thetas32 = np.delete(thetas32, tpcs[1:], 1)
-                        elif thetas32.ndim == 1:
+                        else:
                             thet = np.sum(thetas32[tpcs], axis=0)
                             thetas32[tpcs[0]] = thet
                             thetas32 = np.delete(thetas32, tpcs[1:])
-                        else:
-                            self._logger.error(
-                                f"-- -- Thetas32 has wrong number of dimensions when applying model edition actions (f)")
-                            sys.exit(1)
-        if thetas32.ndim == 2:
+        if is_2d:
             thetas32 = normalize(thetas32, axis=1, norm='l1')
-        elif thetas32.ndim == 1:
+        else:
             thetas32 = normalize(thetas32.reshape(1, -1), axis=1, norm='l1')
         doc_topics_file_npy = infer_path.joinpath("doc-topics.npy")
         np.save(doc_topics_file_npy, thetas32)
@@ -225,10 +215,8 @@ class Inferencer(object):
 
         # Thresholding and normalization
         thetas32[thetas32 < thetas_thr] = 0
-        if thetas32.ndim == 2:
-            thetas32 = normalize(thetas32, axis=1, norm='l1')
-        elif thetas32.ndim == 1:
-            thetas32 = normalize(thetas32.reshape(1, -1), axis=1, norm='l1')
+        # apply_model_editions always returns a 2-D array
+        thetas32 = normalize(thetas32, axis=1, norm='l1')
 
         # Transform thetas into string representation
         thetas32_rpr = self.transform_inference_output(thetas32, max_sum)
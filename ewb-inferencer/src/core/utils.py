@@ -10,7 +10,6 @@ import json
 import os
 import pathlib
 import pickle
-import random
 import shutil
 from typing import Union
 
@@ -83,7 +82,7 @@ def unpickler_avitm_for_ewb_inferencer(path_pickle: pathlib.Path, logger: loggin
 
 
 def sum_up_to(vector: np.ndarray, max_sum: int) -> np.ndarray:
-    """It takes in a vector and a max_sum value and returns a NumPy array with the same shape as vector but with the values adjusted such that their sum is equal to max_sum.
+    """It takes in a vector and a max_sum value and returns a NumPy array with the same shape as vector but with the values adjusted such that their sum is equal to max_sum. The missing units are assigned deterministically, by largest remainder, among the elements that are still nonzero after flooring (or among all the nonzero elements if none is).
 
     Parameters
     ----------
@@ -97,11 +96,20 @@ def sum_up_to(vector: np.ndarray, max_sum: int) -> np.ndarray:
     x: np.ndarray
         A NumPy array of the same shape as vector but with the values adjusted such that their sum is equal to max_sum.
     """
-    x = np.array(list(map(np.int_, vector*max_sum))).ravel()
-    pos_idx = list(np.where(x != 0)[0])
-    while np.sum(x) != max_sum:
-        idx = random.choice(pos_idx)
-        x[idx] += 1
+    scaled = np.asarray(vector, dtype=np.float64).ravel() * max_sum
+    x = np.floor(scaled).astype(np.int64)
+    # Only the elements that are still nonzero after flooring take part in the apportionment
+    pos_idx = np.flatnonzero(x)
+    if pos_idx.size == 0:
+        pos_idx = np.flatnonzero(scaled)
+    deficit = int(max_sum - x.sum())
+    if deficit > 0 and pos_idx.size > 0:
+        # Largest remainder (Hamilton) apportionment: the units missing to reach max_sum go to the elements with the largest fractional parts
+        q, r = divmod(deficit, pos_idx.size)
+        x[pos_idx] += q
+        if r:
+            frac = scaled[pos_idx] - np.floor(scaled[pos_idx])
+            x[pos_idx[np.argpartition(-frac, r - 1)[:r]]] += 1
     return x
 
 
@@ -169,8 +177,8 @@ def get_infer_config(logger: logging.Logger,
 
         # Copy current model folder to the backup folder.
         shutil.move(infer_path, old_model_dir)
-        print(
-            f'-- -- Creating backup of existing inference model in {old_model_dir}')
+        logger.info(
+            '-- -- Creating backup of existing inference model in %s', old_model_dir)
     infer_path.mkdir()
 
     tr_config = \
@@ -0,0 +1,52 @@
+"""
+Tests for the Inferencer's post-processing of the inferred document-topic proportions.
+
+Run from the ewb-inferencer folder with: python -m pytest tests
+"""
+
+import numpy as np
+import pytest
+from src.core.inferencer.base.inferencer import Inferencer
+
+
+class DummyInferencer(Inferencer):
+    def predict(self):
+        pass
+
+
+@pytest.fixture
+def inferencer(tmp_path):
+    inferencer = DummyInferencer(logger=None)
+    # No TMmodel/edits.txt in the model folder, so no model editions are applied
+    inferencer._inferConfig = {
+        "model_for_infer_path": tmp_path.as_posix(),
+        "infer_path": tmp_path.as_posix(),
+    }
+    return inferencer
+
+
+def _weights(rpr: str) -> dict:
+    return {tpc: int(val) for tpc, val in (el.split("|") for el in rpr.split())}
+
+
+def test_get_final_thetas_1d(inferencer):
+    thetas = np.array([0.5, 0.3, 0.2], dtype=np.float64)
+
+    rpr = inferencer.get_final_thetas(thetas, thetas_thr=3e-3, max_sum=1000)
+
+    assert len(rpr) == 1
+    assert _weights(rpr[0]["thetas"]) == {"t0": 500, "t1": 300, "t2": 200}
+
+
+def test_get_final_thetas_2d(inferencer):
+    thetas = np.array([[0.5, 0.3, 0.2],
+                       [0.001, 0.799, 0.2]], dtype=np.float64)
+
+    rpr = inferencer.get_final_thetas(thetas, thetas_thr=3e-3, max_sum=1000)
+
+    assert len(rpr) == 2
+    assert _weights(rpr[0]["thetas"]) == {"t0": 500, "t1": 300, "t2": 200}
+    # t0 is below the threshold, so it is dropped and the rest is renormalized
+    weights = _weights(rpr[1]["thetas"])
+    assert "t0" not in weights
+    assert sum(weights.values()) == 1000
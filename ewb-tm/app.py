@@ -1,6 +1,8 @@
 """Main application entry point
 """
 import logging
+import os
+from logging.handlers import RotatingFileHandler
 from src.apis import api
 from flask import Flask
 from pyfiglet import figlet_format
@@ -12,11 +14,22 @@ app = Flask(__name__)
 app.config["RESTX_MASK_SWAGGER"] = False
 api.init_app(app)
 
+# Persist the logs of every component in a single rotating file, opened once for the whole process
+log_dir = os.environ.get('LOG_DIR', '/data/logs')
+os.makedirs(log_dir, exist_ok=True)
+handler = RotatingFileHandler(os.path.join(log_dir, "ewb-tm.log"),
+                              maxBytes=64 << 20, backupCount=8)
+handler.setFormatter(logging.Formatter(
+    "%(asctime)s %(levelname)s %(name)s %(message)s"))
+logging.getLogger().addHandler(handler)
+
 if __name__ == '__main__':
     cprint(figlet_format("EWB TM API",
            font='big'), 'blue', attrs=['bold'])
     print('\n')    
     
     #app.run(host='0.0.0.0', port=82, debug=True)
+    # Waitress is the production WSGI server; its default of 4 threads caps the number of requests the API can keep waiting on Solr at once, so it is raised (it can be tuned through WAITRESS_THREADS)
     from waitress import serve
-    serve(app, host="0.0.0.0", port=82)
+    serve(app, host="0.0.0.0", port=82,
+          threads=int(os.environ.get('WAITRESS_THREADS', 16)))
@@ -1,3 +1,5 @@
+import orjson
+from flask import make_response
 from flask_restx import Api
 
 from .namespace_corpora import api as ns1
@@ -14,4 +16,13 @@ api = Api(
 api.add_namespace(ns2, path='/collections')
 api.add_namespace(ns1, path='/corpora')
 api.add_namespace(ns3, path='/models')
-api.add_namespace(ns4, path='/queries')
\ No newline at end of file
+api.add_namespace(ns4, path='/queries')
+
+
+@api.representation('application/json')
+def output_json(data, code, headers=None):
+    """Serializes the JSON responses of all namespaces with orjson, which writes bytes directly. Non-string keys are still accepted, as with the default encoder."""
+    resp = make_response(orjson.dumps(
+        data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS), code)
+    resp.headers.extend(headers or {})
+    return resp
@@ -5,7 +5,7 @@ Author: Lorena Calvo-Bartolomé
 Date: 13/04/2023
 """
 
-from flask_restx import Namespace, Resource, reqparse
+from flask_restx import Namespace, Resource, inputs, reqparse
 from src.core.clients.ewb_solr_client import EWBSolrClient
 
 # ======================================================
@@ -47,9 +47,9 @@ q4_parser.add_argument(
 q4_parser.add_argument(
     'threshold', help='Query threshold', required=True)
 q4_parser.add_argument(
-    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content.', required=False)
+    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content.', type=inputs.natural, required=False)
 q4_parser.add_argument(
-    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', required=False)
+    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', type=inputs.natural, required=False)
 
 q5_parser = reqparse.RequestParser()
 q5_parser.add_argument(
@@ -59,9 +59,9 @@ q5_parser.add_argument(
 q5_parser.add_argument(
     'doc_id', help="ID of the document whose similarity is going to be checked against all other documents in 'corpus_collection'", required=True)
 q5_parser.add_argument(
-    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', required=False)
+    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', type=inputs.natural, required=False)
 q5_parser.add_argument(
-    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', required=False)
+    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', type=inputs.natural, required=False)
 
 q6_parser = reqparse.RequestParser()
 q6_parser.add_argument(
@@ -75,17 +75,17 @@ q7_parser.add_argument(
 q7_parser.add_argument(
     'string', help="String to be search in the SearcheableField field'", required=True)
 q7_parser.add_argument(
-    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', required=False)
+    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', type=inputs.natural, required=False)
 q7_parser.add_argument(
-    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', required=False)
+    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', type=inputs.natural, required=False)
 
 q8_parser = reqparse.RequestParser()
 q8_parser.add_argument(
     'model_collection', help='Name of the model collection', required=True)
 q8_parser.add_argument(
-    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', required=False)
+    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', type=inputs.natural, required=False)
 q8_parser.add_argument(
-    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', required=False)
+    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', type=inputs.natural, required=False)
 
 q9_parser = reqparse.RequestParser()
 q9_parser.add_argument(
@@ -95,17 +95,17 @@ q9_parser.add_argument(
 q9_parser.add_argument(
     'topic_id', help="ID of the topic whose top documents according to 'model_name' are being searched", required=True)
 q9_parser.add_argument(
-    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', required=False)
+    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', type=inputs.natural, required=False)
 q9_parser.add_argument(
-    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', required=False)
+    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', type=inputs.natural, required=False)
 
 q10_parser = reqparse.RequestParser()
 q10_parser.add_argument(
     'model_collection', help='Name of the model collection', required=True)
 q10_parser.add_argument(
-    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', required=False)
+    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', type=inputs.natural, required=False)
 q10_parser.add_argument(
-    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', required=False)
+    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', type=inputs.natural, required=False)
 
 q11_parser = reqparse.RequestParser()
 q11_parser.add_argument(
@@ -119,9 +119,9 @@ q12_parser.add_argument(
 q12_parser.add_argument(
     'topic_id', help='ID of the topic whose whose word-topic distribution is to be retrieved', required=False)
 q12_parser.add_argument(
-    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', required=False)
+    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', type=inputs.natural, required=False)
 q12_parser.add_argument(
-    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', required=False)
+    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', type=inputs.natural, required=False)
 
 q13_parser = reqparse.RequestParser()
 q13_parser.add_argument(
@@ -145,9 +145,9 @@ q14_parser.add_argument(
 q14_parser.add_argument(
     'text_to_infer', help="Text to be inferred", required=True)
 q14_parser.add_argument(
-    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', required=False)
+    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', type=inputs.natural, required=False)
 q14_parser.add_argument(
-    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', required=False)
+    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', type=inputs.natural, required=False)
 
 q15_parser = reqparse.RequestParser()
 q15_parser.add_argument(
@@ -161,9 +161,9 @@ q16_parser.add_argument(
 q16_parser.add_argument(
     'model_name', help='Name of the model reponsible for the creation of the doc-topic distribution to be retrieved', required=True)
 q16_parser.add_argument(
-    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', required=False)
+    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', type=inputs.natural, required=False)
 q16_parser.add_argument(
-    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', required=False)
+    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', type=inputs.natural, required=False)
 
 q17_parser = reqparse.RequestParser()
 q17_parser.add_argument(
@@ -181,9 +181,9 @@ q18_parser.add_argument(
 q18_parser.add_argument(
     'words', help='Words to get the BOW from, separated by commas', required=True)
 q18_parser.add_argument(
-    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', required=False)
+    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', type=inputs.natural, required=False)
 q18_parser.add_argument(
-    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', required=False)
+    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', type=inputs.natural, required=False)
 
 q19_parser = reqparse.RequestParser()
 q19_parser.add_argument(
@@ -191,9 +191,9 @@ q19_parser.add_argument(
 q19_parser.add_argument(
     'user', help='Identifier/name of the user whose relevant topics are going to be retrieved', required=True)
 q19_parser.add_argument(
-    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', required=False)
+    'start', help='Specifies an offset (by default, 0) into the responses at which Solr should begin displaying content', type=inputs.natural, required=False)
 q19_parser.add_argument(
-    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', required=False)
+    'rows', help='Controls how many rows of responses are displayed at a time (default value: maximum number of docs in the collection)', type=inputs.natural, required=False)
 
 
 
@@ -13,11 +13,31 @@ Date: 27/03/2023
 
 import logging
 import os
-from typing import List, Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Iterable, List, Union
 from urllib import parse
-from typing import List
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Maximum time (in ms) Solr waits before committing the updates sent by the client
+COMMIT_WITHIN = 1000
+
+
+def _json_default(obj):
+    """Serializes the values of an indexing payload that orjson does not support natively. These are datetime subclasses such as pd.Timestamp, which are formatted as Solr instants (ISO_INSTANT), with naive ones assumed to be in UTC, and missing ones (NaT) becoming empty strings."""
+    if isinstance(obj, datetime):
+        # NaT is the only datetime that is not equal to itself
+        if obj != obj:
+            return ""
+        if obj.tzinfo is not None:
+            obj = obj.astimezone(timezone.utc)
+        return obj.replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
 
 
 class SolrResults(object):
@@ -156,7 +176,7 @@ class SolrResp(object):
         results = {}
 
         # Get JSON object of the result
-        resp = resp.json()
+        resp = orjson.loads(resp.content)
 
         # If response header has status 0, request is acknowledged
         if 'responseHeader' in resp and resp['responseHeader']['status'] == 0:
@@ -166,6 +186,9 @@ class SolrResp(object):
             # If there is an error in response header, set status code and text attributes accordingly
             status_code = resp['responseHeader']['status']
             text = resp['error']['msg']
+            # Solr reports an attempt to create an existing collection as a generic error; map it to a conflict
+            if 'already exists' in text:
+                status_code = 409
             logger.error(
                 f'-- -- Request generated an error {status_code}: {text}')
 
@@ -184,19 +207,39 @@ class SolrClient(object):
     A class to handle Solr API requests.
     """
 
-    def __init__(self, logger: logging.Logger) -> None:
+    def __init__(self,
+                 logger: logging.Logger,
+                 max_workers: int = 8) -> None:
         """
         Parameters
         ----------
         logger : logging.Logger
             The logger object to log messages and errors.
+        max_workers : int, defaults to 8
+            Maximum number of threads used to send requests to Solr concurrently (e.g., when indexing batches of documents).
         """
 
         # Get the Solr URL from the environment variables
         self.solr_url = os.environ.get('SOLR_URL')
 
-        # Initialize requests session and logger
+        # Initialize requests session and logger. All requests to Solr go through the session so that connections are pooled and reused across calls
         self.solr = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(total=3,
+                              backoff_factor=0.5,
+                              status_forcelist=[502, 503, 504],
+                              raise_on_status=False))
+        self.solr.mount("http://", adapter)
+        self.solr.mount("https://", adapter)
+        # Every Solr response is requested as JSON, whatever the endpoint defaults to
+        self.solr.params = {"wt": "json"}
+        self.solr.headers["Accept"] = "application/json"
+
+        # Thread pool to send requests to Solr concurrently. Threads spend their time waiting on sockets, so the GIL is not a bottleneck
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
         # self.logger = logger
         import logging
         logging.basicConfig(level='DEBUG')
@@ -228,14 +271,14 @@ class SolrClient(object):
 
         # Send request
         if type == "get":
-            resp = requests.get(
+            resp = self.solr.get(
                 url=url,
                 timeout=timeout,
                 **params
             )
             pass
         elif type == "post":
-            resp = requests.post(
+            resp = self.solr.post(
                 url=url,
                 timeout=timeout,
                 **params
@@ -357,14 +400,7 @@ class SolrClient(object):
             The HTTP status code of the Solr API response.
         """
 
-        # Check if collection already exists
-        colls, _ = self.list_collections()
-        if col_name in colls:
-            solr_resp = SolrResp.from_error(
-                409, "Collection {} already exists".format(col_name))
-            return _, solr_resp.status_code
-
-        # Carry on with creation if collection does not exists
+        # Solr itself checks whether the collection already exists, in which case the response is mapped to a 409 status code
         headers_ = {"Content-Type": "application/json"}
         data = {
             "create": {
@@ -426,9 +462,8 @@ class SolrClient(object):
         headers_ = {"Content-Type": "application/xml"}
         data_ = "<delete><query>(id:" + id + ")</query></delete>"
         params_ = {
-            'commitWithin': '1000',
-            'overwrite': 'true',
-            'wt': 'json'
+            'commitWithin': str(COMMIT_WITHIN),
+            'overwrite': 'true'
         }
 
         url_ = '{}/solr/{}/update'.format(self.solr_url, col_name)
@@ -439,15 +474,16 @@ class SolrClient(object):
 
         return solr_resp.status_code
 
-    def list_collections(self) -> Union[List[dict], int]:
+    def list_collections(self) -> Union[List[str], int]:
         """
-        Lists all Solr collections and returns a list of dictionaries, where each dictionary has a key "name" with the value of the collection name,
-        and the HTTP status code.
+        Lists all Solr collections and returns the list of their names, as given by Solr (no further wrapping is needed), and the HTTP status code.
 
         Returns
         -------
-        List[dict]
-            A list of dictionaries with the names of the collections.
+        List[str]
+            A list with the names of the collections.
+        int
+            The HTTP status code of the Solr API response.
         """
 
         url_ = '{}/api/collections'.format(self.solr_url)
@@ -491,16 +527,17 @@ class SolrClient(object):
         headers_ = {'Content-type': 'application/json'}
 
         params = {
-            'commitWithin': '1000',
-            'overwrite': 'true',
-            'wt': 'json'
+            'commitWithin': str(COMMIT_WITHIN),
+            'overwrite': 'true'
         }
 
         url_ = '{}/solr/{}/update'.format(self.solr_url, col_name)
 
-        # Send request to Solr
+        # Send request to Solr, with the batch serialized straight to bytes (numpy values and datetime subclasses included)
         solr_resp = self._do_request(
-            type="post", url=url_, headers=headers_, json=docs_batch,
+            type="post", url=url_, headers=headers_,
+            data=orjson.dumps(docs_batch, default=_json_default,
+                              option=orjson.OPT_SERIALIZE_NUMPY),
             params=params, proxies={})
 
         if solr_resp.status_code == 200:
@@ -510,39 +547,45 @@ class SolrClient(object):
         return solr_resp.status_code
 
     def index_documents(self,
-                        json_docs: List[dict],
+                        json_docs: Iterable[dict],
                         col_name: str,
-                        batch_size: int = 100) -> None:
-        """It takes a list of documents in JSON format and a Solr collection name, splits the list into batches, and sends a POST request to the Solr server to index the documents in batches. The method returns the status code of the response.
+                        batch_size: int = 1000) -> None:
+        """It takes an iterable of documents in JSON format and a Solr collection name, splits it into batches, and sends a POST request to the Solr server to index the documents in batches. Since documents are consumed as they come, 'json_docs' can be a generator, so that the full set of documents never needs to be resident in memory.
 
         Parameters
         ----------
-        json_docs : list[dict]
-            A list of dictionaries where each dictionary represents a document to be indexed.
+        json_docs : Iterable[dict]
+            An iterable of dictionaries where each dictionary represents a document to be indexed.
         col_name : str 
             The name of the Solr collection to index the documents into.
         batch_size : int
             Batch size with which the documents will be indexed
         """
 
-        docs_batch = []
+        # The total number of documents is only known if json_docs is sized
+        to_index = len(json_docs) if hasattr(json_docs, '__len__') else '?'
+
+        # Index batches of exactly batch_size documents at a time (the last one may be smaller). Batches are sent concurrently, keeping at most 2 * max_workers of them in flight so that the next batch is built while Solr processes the previous ones
+        docs_iter = iter(json_docs)
         index_from = 0
-        to_index = len(json_docs)
-        for index, doc in enumerate(json_docs):
-            docs_batch.append(doc)
-            # To index batches of documents at a time.
-            if index % batch_size == 0 and index != 0:
-                # Index batch to Solr
-                self.index_batch(docs_batch, col_name, to_index,
-                                 index_from=index_from, index_to=index)
-                docs_batch = []
-                index_from = index + 1
-                self.logger.info("==== indexed {} documents ======"
-                                 .format(index))
-        # To index the rest, when 'documents' list < batch_size.
-        if docs_batch:
-            self.index_batch(docs_batch, col_name, to_index,
-                             index_from=index_from, index_to=index)
+        in_flight = set()
+        while True:
+            docs_batch = list(islice(docs_iter, batch_size))
+            if not docs_batch:
+                break
+            if len(in_flight) >= 2 * self.max_workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            index_to = index_from + len(docs_batch)
+            in_flight.add(self._executor.submit(
+                self.index_batch, docs_batch, col_name, to_index,
+                index_from=index_from, index_to=index_to))
+            index_from = index_to
+
+        # Wait for the remaining batches (re-raising any error that occurred while sending them)
+        for future in wait(in_flight).done:
+            future.result()
         self.logger.info("-- -- Finished indexing")
 
         return
@@ -581,17 +624,8 @@ class SolrClient(object):
             results = solr.execute_query('*:*')
         """
 
-        # Prepare query
-        params = {"q": q}
-        params.update(kwargs)
-
-        # We want the result of the query as json
-        params["wt"] = "json"
-
-        # Encode query
-        self.logger.info(params)
-        query_string = parse.urlencode(params)
-        self.logger.info(query_string)
+        # Prepare and encode query in one pass. The query is not logged, since vector queries (e.g., Q5, Q12) can carry long strings
+        query_string = parse.urlencode({"q": q, **kwargs})
 
         url_ = '{}/solr/{}/select?{}'.format(self.solr_url,
                                              col_name, query_string)
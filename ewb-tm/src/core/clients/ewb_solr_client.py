@@ -9,14 +9,55 @@ import configparser
 import logging
 import pathlib
 import re
+import threading
 import time
 import pandas as pd
-from typing import List, Union
+from typing import Iterable, List, Union
 from src.core.clients.external.ewb_inferencer_client import EWBInferencerClient
-from src.core.clients.base.solr_client import SolrClient
+from src.core.clients.base.solr_client import COMMIT_WITHIN, SolrClient, SolrResults
 from src.core.entities.corpus import Corpus
 from src.core.entities.model import Model
-from src.core.entities.queries import Queries
+from src.core.entities.queries import QUERIES
+
+# Maximum number of query results kept in the results cache
+RESULTS_CACHE_SIZE = 4096
+# Seconds after a write during which no query results are cached, so that results read before Solr commits the write (commitWithin) and opens a new searcher are not kept
+RESULTS_CACHE_WRITE_DELAY = 2 * COMMIT_WITHIN / 1000
+
+
+class _ResultsCache(object):
+    """TTL cache for the results of queries that only change when a collection is updated (Q3, Q8, Q10, and the vector queries Q5, Q12 and Q14). A single instance is shared by every EWBSolrClient in the process (each API namespace creates its own client), so that a write made through any of them invalidates the cached results for all.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._lock = threading.Lock()
+        # {key: (expiry time, results)}
+        self._entries = {}
+        # Results of queries issued before this time may predate the commit of the last write, so they are not cached
+        self._valid_from = 0.0
+
+    def get(self, key: tuple, now: float) -> Union[SolrResults, None]:
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        return None
+
+    def put(self, key: tuple, results: SolrResults, issued_at: float, ttl: float) -> None:
+        with self._lock:
+            if issued_at < self._valid_from:
+                return
+            if len(self._entries) >= self._size:
+                self._entries.clear()
+            self._entries[key] = (issued_at + ttl, results)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._valid_from = time.monotonic() + RESULTS_CACHE_WRITE_DELAY
+
+
+_RESULTS_CACHE = _ResultsCache(RESULTS_CACHE_SIZE)
 
 
 class EWBSolrClient(SolrClient):
@@ -36,9 +77,13 @@ class EWBSolrClient(SolrClient):
         self.path_source = pathlib.Path(cf.get('restapi', 'path_source'))
         self.thetas_max_sum = int(cf.get('restapi', 'thetas_max_sum'))
         self.betas_max_sum = int(cf.get('restapi', 'betas_max_sum'))
+        self.cache_ttl = float(cf.get('restapi', 'cache_ttl', fallback=60))
 
-        # Create Queries object for managing queries
-        self.querier = Queries()
+        # Results cache shared by every client of the process
+        self._results_cache = _RESULTS_CACHE
+
+        # Shared Queries object for managing queries
+        self.querier = QUERIES
 
         # Create InferencerClient to send requests to the Inferencer API
         self.inferencer = EWBInferencerClient(logger)
@@ -664,30 +709,88 @@ class EWBSolrClient(SolrClient):
     # ======================================================
     # AUXILIARY FUNCTIONS
     # ======================================================
-    def custom_start_and_rows(self, start, rows, col) -> Union[str, str]:
+    def index_documents(self,
+                        json_docs: Iterable[dict],
+                        col_name: str,
+                        batch_size: int = 1000) -> None:
+        """Same as SolrClient.index_documents, but also invalidates the results cache."""
+        try:
+            super().index_documents(json_docs, col_name, batch_size)
+        finally:
+            self._results_cache.invalidate()
+
+    def delete_collection(self, col_name: str) -> Union[List[dict], int]:
+        """Same as SolrClient.delete_collection, but also invalidates the results cache."""
+        try:
+            return super().delete_collection(col_name)
+        finally:
+            self._results_cache.invalidate()
+
+    def delete_doc_by_id(self, col_name: str, id: int) -> int:
+        """Same as SolrClient.delete_doc_by_id, but also invalidates the results cache."""
+        try:
+            return super().delete_doc_by_id(col_name, id)
+        finally:
+            self._results_cache.invalidate()
+
+    def execute_cached_query(self,
+                             key: tuple,
+                             q: dict,
+                             col_name: str) -> Union[int, SolrResults]:
+        """Executes a query whose results only change when a collection is indexed or deleted, serving it from the results cache for up to self.cache_ttl seconds. The cache is invalidated on every update made through any client of the process, and results are not cached again until the update has been committed by Solr.
+
+        Parameters
+        ----------
+        key : tuple
+            Key identifying the query and its arguments.
+        q : dict
+            Customized query, including its 'q'.
+        col_name : str
+            Name of the collection to query.
+
+        Returns
+        -------
+        sc : int
+            The status code of the response.
+        results : SolrResults
+            The results of the query.
+        """
+
+        now = time.monotonic()
+        cached = self._results_cache.get(key, now)
+        if cached is not None:
+            return 200, cached
+
+        sc, results = self.execute_query(col_name=col_name, **q)
+        if sc == 200:
+            self._results_cache.put(key, results, now, self.cache_ttl)
+
+        return sc, results
+
+    def custom_start_and_rows(self, start, rows, col) -> Union[int, int]:
         """Checks if start and rows are None. If so, it returns the number of documents in the collection as the value for rows and 0 as the value for start.
 
         Parameters
         ----------
-        start : str
+        start : int
             Start parameter of the query.
-        rows : str
+        rows : int
             Rows parameter of the query.
         col : str
             Name of the collection.
 
         Returns
         -------
-        start : str
+        start : int
             Final start parameter of the query.
-        rows : str
+        rows : int
             Final rows parameter of the query.
         """
         if start is None:
-            start = str(0)
+            start = 0
         if rows is None:
             numFound_dict, sc = self.do_Q3(col)
-            rows = str(numFound_dict['ndocs'])
+            rows = numFound_dict['ndocs']
 
             if sc != 200:
                 self.logger.error(
@@ -696,6 +799,46 @@ class EWBSolrClient(SolrClient):
 
         return start, rows
 
+    def execute_Q1(self,
+                   corpus_col: str,
+                   doc_id: str,
+                   model_name: str) -> Union[dict, int]:
+        """Customizes and executes query Q1, without the collection checks carried out by do_Q1, so that it can also be used by queries that have already made them (e.g., do_Q5).
+
+        Parameters
+        ----------
+        corpus_col : str
+            Name of the corpus collection (in lowercase).
+        doc_id : str
+            ID of the document to be retrieved.
+        model_name : str
+            Name of the model to be used for the retrieval (in lowercase).
+
+        Returns
+        -------
+        thetas: dict
+            JSON object with the document-topic proportions (thetas), or -1 if the document has none
+        sc : int
+            The status code of the response.
+        """
+
+        q1 = self.querier.customize_Q1(id=doc_id, model_name=model_name)
+        sc, results = self.execute_query(
+            col_name=corpus_col, **q1)
+
+        if sc != 200:
+            self.logger.error(
+                "-- -- Error executing query Q1. Aborting operation...")
+            return
+
+        # Return -1 if thetas field is not found (it could happen that a document in a collection has not thetas representation since it was not keeped within the corpus used for training the model)
+        if 'doctpc_' + model_name in results.docs[0].keys():
+            resp = {'thetas': results.docs[0]['doctpc_' + model_name]}
+        else:
+            resp = {'thetas': -1}
+
+        return resp, sc
+
     def pairs_sims_process(
         self,
         df: pd.DataFrame,
@@ -811,24 +954,7 @@ class EWBSolrClient(SolrClient):
             return
 
         # 3. Execute query
-        q1 = self.querier.customize_Q1(id=doc_id, model_name=model_name)
-        params = {k: v for k, v in q1.items() if k != 'q'}
-
-        sc, results = self.execute_query(
-            q=q1['q'], col_name=corpus_col, **params)
-
-        if sc != 200:
-            self.logger.error(
-                f"-- -- Error executing query Q1. Aborting operation...")
-            return
-
-        # 4. Return -1 if thetas field is not found (it could happen that a document in a collection has not thetas representation since it was not keeped within the corpus used for training the model)
-        if 'doctpc_' + model_name in results.docs[0].keys():
-            resp = {'thetas': results.docs[0]['doctpc_' + model_name]}
-        else:
-            resp = {'thetas': -1}
-
-        return resp, sc
+        return self.execute_Q1(corpus_col=corpus_col, doc_id=doc_id, model_name=model_name)
 
     def do_Q2(self, corpus_col: str) -> Union[dict, int]:
         """
@@ -856,9 +982,8 @@ class EWBSolrClient(SolrClient):
 
         # 2. Execute query (to self.corpus_col)
         q2 = self.querier.customize_Q2(corpus_name=corpus_col)
-        params = {k: v for k, v in q2.items() if k != 'q'}
         sc, results = self.execute_query(
-            q=q2['q'], col_name=self.corpus_col, **params)
+            col_name=self.corpus_col, **q2)
 
         if sc != 200:
             self.logger.error(
@@ -903,10 +1028,9 @@ class EWBSolrClient(SolrClient):
 
         # 2. Execute query
         q3 = self.querier.customize_Q3()
-        params = {k: v for k, v in q3.items() if k != 'q'}
 
-        sc, results = self.execute_query(
-            q=q3['q'], col_name=col, **params)
+        sc, results = self.execute_cached_query(
+            key=("Q3", col), q=q3, col_name=col)
 
         # 3. Filter results
         if sc != 200:
@@ -921,8 +1045,8 @@ class EWBSolrClient(SolrClient):
               model_name: str,
               topic_id: str,
               thr: str,
-              start: str,
-              rows: str) -> Union[dict, int]:
+              start: int,
+              rows: int) -> Union[dict, int]:
         """Executes query Q4.
 
         Parameters
@@ -935,9 +1059,9 @@ class EWBSolrClient(SolrClient):
             ID of the topic to be retrieved
         thr: str
             Threshold to be used for the retrieval
-        start: str
+        start: int
             Offset into the responses at which Solr should begin displaying content
-        rows: str
+        rows: int
             How many rows of responses are displayed at a time 
 
         Returns
@@ -966,10 +1090,8 @@ class EWBSolrClient(SolrClient):
         # 4. Execute query
         q4 = self.querier.customize_Q4(
             model_name=model_name, topic=topic_id, threshold=thr, start=start, rows=rows)
-        params = {k: v for k, v in q4.items() if k != 'q'}
-
         sc, results = self.execute_query(
-            q=q4['q'], col_name=corpus_col, **params)
+            col_name=corpus_col, **q4)
 
         if sc != 200:
             self.logger.error(
@@ -982,8 +1104,8 @@ class EWBSolrClient(SolrClient):
               corpus_col: str,
               model_name: str,
               doc_id: str,
-              start: str,
-              rows: str) -> Union[dict, int]:
+              start: int,
+              rows: int) -> Union[dict, int]:
         """Executes query Q5.
 
         Parameters
@@ -994,9 +1116,9 @@ class EWBSolrClient(SolrClient):
             Name of the model to be used for the retrieval
         doc_id: str
             ID of the document whose similarity is going to be checked against all other documents in 'corpus_col'
-         start: str
+         start: int
             Offset into the responses at which Solr should begin displaying content
-        rows: str
+        rows: int
             How many rows of responses are displayed at a time 
 
         Returns
@@ -1019,9 +1141,17 @@ class EWBSolrClient(SolrClient):
         if not self.check_corpus_has_model(corpus_col, model_name):
             return
 
-        # 3. Execute Q1 to get thetas of document given by doc_id
-        thetas_dict, sc = self.do_Q1(
-            corpus_col=corpus_col, model_name=model_name, doc_id=doc_id)
+        # 3. Get the thetas of the document given by doc_id (Q1). The query is sent in the background so that it overlaps with the customization of start and rows
+        q1_future = self._executor.submit(
+            self.execute_Q1, corpus_col=corpus_col, doc_id=doc_id, model_name=model_name)
+        start, rows = self.custom_start_and_rows(start, rows, corpus_col)
+
+        q1_resp = q1_future.result()
+        if q1_resp is None:
+            self.logger.error(
+                "-- -- Error attaining the thetas of the document while executing query Q5. Aborting operation...")
+            return
+        thetas_dict, sc = q1_resp
         thetas = thetas_dict['thetas']
 
         # 4. Check that thetas are available on the document given by doc_id. If not, infer them
@@ -1042,28 +1172,23 @@ class EWBSolrClient(SolrClient):
             self.logger.info(
                 f"-- -- Thetas attained in {inf_resp.time} seconds: {thetas}")
 
-        # 4. Customize start and rows
-        start, rows = self.custom_start_and_rows(start, rows, corpus_col)
-
         # 5. Execute query
         q5 = self.querier.customize_Q5(
             model_name=model_name, thetas=thetas,
             start=start, rows=rows)
-        params = {k: v for k, v in q5.items() if k != 'q'}
-
-        sc, results = self.execute_query(
-            q=q5['q'], col_name=corpus_col, **params)
+        sc, results = self.execute_cached_query(
+            key=(corpus_col, tuple(q5.items())), q=q5, col_name=corpus_col)
 
         if sc != 200:
             self.logger.error(
                 f"-- -- Error executing query Q5. Aborting operation...")
             return
 
-        # 6. Normalize scores
-        for el in results.docs:
-            el['score'] *= (100/(self.thetas_max_sum ^ 2))
+        # 6. Normalize scores (on copies, since the results may be shared through the results cache)
+        docs = [{**el, 'score': el['score'] * (100/(self.thetas_max_sum ^ 2))}
+                for el in results.docs]
 
-        return results.docs, sc
+        return docs, sc
 
     def do_Q6(self,
               corpus_col: str,
@@ -1100,10 +1225,8 @@ class EWBSolrClient(SolrClient):
 
         # 3. Execute query
         q6 = self.querier.customize_Q6(id=doc_id, meta_fields=meta_fields)
-        params = {k: v for k, v in q6.items() if k != 'q'}
-
         sc, results = self.execute_query(
-            q=q6['q'], col_name=corpus_col, **params)
+            col_name=corpus_col, **q6)
 
         if sc != 200:
             self.logger.error(
@@ -1115,8 +1238,8 @@ class EWBSolrClient(SolrClient):
     def do_Q7(self,
               corpus_col: str,
               string: str,
-              start: str,
-              rows: str) -> Union[dict, int]:
+              start: int,
+              rows: int) -> Union[dict, int]:
         """Executes query Q7.
 
         Parameters
@@ -1144,10 +1267,8 @@ class EWBSolrClient(SolrClient):
         # 2. Get number of docs in the collection (it will be the maximum number of docs to be retireved) if rows is not specified
         if rows is None:
             q3 = self.querier.customize_Q3()
-            params = {k: v for k, v in q3.items() if k != 'q'}
-
             sc, results = self.execute_query(
-                q=q3['q'], col_name=corpus_col, **params)
+                col_name=corpus_col, **q3)
 
             if sc != 200:
                 self.logger.error(
@@ -1155,7 +1276,7 @@ class EWBSolrClient(SolrClient):
                 return
             rows = results.hits
         if start is None:
-            start = str(0)
+            start = 0
 
         # 2. Execute query
         q7 = self.querier.customize_Q7(
@@ -1163,10 +1284,8 @@ class EWBSolrClient(SolrClient):
             string=string,
             start=start,
             rows=rows)
-        params = {k: v for k, v in q7.items() if k != 'q'}
-
         sc, results = self.execute_query(
-            q=q7['q'], col_name=corpus_col, **params)
+            col_name=corpus_col, **q7)
 
         if sc != 200:
             self.logger.error(
@@ -1177,17 +1296,17 @@ class EWBSolrClient(SolrClient):
 
     def do_Q8(self,
               model_col: str,
-              start: str,
-              rows: str) -> Union[dict, int]:
+              start: int,
+              rows: int) -> Union[dict, int]:
         """Executes query Q8.
 
         Parameters
         ----------
         model_col: str
             Name of the model collection
-        start: str
+        start: int
             Index of the first document to be retrieved
-        rows: str
+        rows: int
             Number of documents to be retrieved
 
         Returns
@@ -1210,10 +1329,9 @@ class EWBSolrClient(SolrClient):
 
         # 4. Execute query
         q8 = self.querier.customize_Q8(start=start, rows=rows)
-        params = {k: v for k, v in q8.items() if k != 'q'}
 
-        sc, results = self.execute_query(
-            q=q8['q'], col_name=model_col, **params)
+        sc, results = self.execute_cached_query(
+            key=("Q8", model_col, start, rows), q=q8, col_name=model_col)
 
         if sc != 200:
             self.logger.error(
@@ -1226,8 +1344,8 @@ class EWBSolrClient(SolrClient):
               corpus_col: str,
               model_name: str,
               topic_id: str,
-              start: str,
-              rows: str) -> Union[dict, int]:
+              start: int,
+              rows: int) -> Union[dict, int]:
         """Executes query Q9.
 
         Parameters
@@ -1238,9 +1356,9 @@ class EWBSolrClient(SolrClient):
             Name of the model collection on which the search will be based
         topic_id: str
             ID of the topic whose top-documents will be retrieved
-        start: str
+        start: int
             Index of the first document to be retrieved
-        rows: str
+        rows: int
             Number of documents to be retrieved
 
         Returns
@@ -1268,7 +1386,15 @@ class EWBSolrClient(SolrClient):
         # We limit the maximum number of results since they are top-documnts
         # If more results are needed pagination should be used
         if int(rows) > 100:
-            rows = "100"
+            rows = 100
+
+        # 4. Get the topic's top words (Q10) in the background, as it does not depend on the results of Q9
+        q10_future = self._executor.submit(
+            self.do_Q10,
+            model_col=model_name,
+            start=start,
+            rows=rows,
+            only_id=False)
 
         # 5. Execute query
         q9 = self.querier.customize_Q9(
@@ -1276,10 +1402,8 @@ class EWBSolrClient(SolrClient):
             topic_id=topic_id,
             start=start,
             rows=rows)
-        params = {k: v for k, v in q9.items() if k != 'q'}
-
         sc, results = self.execute_query(
-            q=q9['q'], col_name=corpus_col, **params)
+            col_name=corpus_col, **q9)
 
         if sc != 200:
             self.logger.error(
@@ -1294,12 +1418,7 @@ class EWBSolrClient(SolrClient):
             dict["num_words_per_doc"] = dict.pop("nwords_per_doc")
 
         # 7. Get the topic's top words
-        start, rows = self.custom_start_and_rows(start, rows, model_name)
-        q10_results, sc = self.do_Q10(
-            model_col=model_name,
-            start=start,
-            rows=rows,
-            only_id=False)
+        q10_results, sc = q10_future.result()
         if sc != 200:
             self.logger.error(
                 f"-- -- Error executing query Q10 when using in Q9. Aborting operation...")
@@ -1350,8 +1469,8 @@ class EWBSolrClient(SolrClient):
 
     def do_Q10(self,
                model_col: str,
-               start: str,
-               rows: str,
+               start: int,
+               rows: int,
                only_id: bool) -> Union[dict, int]:
         """Executes query Q10.
 
@@ -1359,9 +1478,9 @@ class EWBSolrClient(SolrClient):
         ----------
         model_col: str
             Name of the model collection whose information is being retrieved
-        start: str
+        start: int
             Index of the first document to be retrieved
-        rows: str
+        rows: int
             Number of documents to be retrieved
 
         Returns
@@ -1385,10 +1504,9 @@ class EWBSolrClient(SolrClient):
         # 4. Execute query
         q10 = self.querier.customize_Q10(
             start=start, rows=rows, only_id=only_id)
-        params = {k: v for k, v in q10.items() if k != 'q'}
 
-        sc, results = self.execute_query(
-            q=q10['q'], col_name=model_col, **params)
+        sc, results = self.execute_cached_query(
+            key=("Q10", model_col, start, rows, only_id), q=q10, col_name=model_col)
 
         if sc != 200:
             self.logger.error(
@@ -1427,10 +1545,8 @@ class EWBSolrClient(SolrClient):
         # 3. Execute query
         q11 = self.querier.customize_Q11(
             topic_id=topic_id)
-        params = {k: v for k, v in q11.items() if k != 'q'}
-
         sc, results = self.execute_query(
-            q=q11['q'], col_name=model_col, **params)
+            col_name=model_col, **q11)
 
         if sc != 200:
             self.logger.error(
@@ -1442,8 +1558,8 @@ class EWBSolrClient(SolrClient):
     def do_Q12(self,
                model_col: str,
                topic_id: str,
-               start: str,
-               rows: str) -> Union[dict, int]:
+               start: int,
+               rows: int) -> Union[dict, int]:
         """Executes query Q12.
 
         Parameters
@@ -1452,9 +1568,9 @@ class EWBSolrClient(SolrClient):
            Name of the model to be used for the retrieval of most correlated topics to a given topic
         topic_id: str
             ID of the topic whose most correlated topics will be retrieved
-        start: str
+        start: int
             Index of the first document to be retrieved
-        rows: str
+        rows: int
             Number of documents to be retrieved
         """
 
@@ -1480,10 +1596,8 @@ class EWBSolrClient(SolrClient):
             betas=betas,
             start=start,
             rows=rows)
-        params = {k: v for k, v in q12.items() if k != 'q'}
-
-        sc, results = self.execute_query(
-            q=q12['q'], col_name=model_col, **params)
+        sc, results = self.execute_cached_query(
+            key=(model_col, tuple(q12.items())), q=q12, col_name=model_col)
 
         if sc != 200:
             self.logger.error(
@@ -1492,10 +1606,10 @@ class EWBSolrClient(SolrClient):
 
         # 6. Normalize scores
         self.logger.info(f"-- --Results: {results.docs}")
-        for el in results.docs:
-            el['score'] *= (100/(self.betas_max_sum ^ 2))
+        docs = [{**el, 'score': el['score'] * (100/(self.betas_max_sum ^ 2))}
+                for el in results.docs]
 
-        return results.docs, sc
+        return docs, sc
 
     def do_Q13(self,
                corpus_col: str,
@@ -1548,10 +1662,8 @@ class EWBSolrClient(SolrClient):
         q13 = self.querier.customize_Q13(
             model_name=model_name, lower_limit=lower_limit,
             upper_limit=upper_limit, year=year, start=start, rows=rows)
-        params = {k: v for k, v in q13.items() if k != 'q'}
-
         sc, score = self.execute_query(
-            q=q13['q'], col_name=corpus_col, **params)
+            col_name=corpus_col, **q13)
 
         if sc != 200:
             self.logger.error(
@@ -1581,8 +1693,8 @@ class EWBSolrClient(SolrClient):
                corpus_col: str,
                model_name: str,
                text_to_infer: str,
-               start: str,
-               rows: str) -> Union[dict, int]:
+               start: int,
+               rows: int) -> Union[dict, int]:
         """Executes query Q14.
 
         Parameters
@@ -1593,9 +1705,9 @@ class EWBSolrClient(SolrClient):
             Name of the model to be used for the retrieval
         text_to_infer: str
             Text to be inferred
-         start: str
+         start: int
             Offset into the responses at which Solr should begin displaying content
-        rows: str
+        rows: int
             How many rows of responses are displayed at a time 
 
         Returns
@@ -1637,21 +1749,19 @@ class EWBSolrClient(SolrClient):
         q14 = self.querier.customize_Q14(
             model_name=model_name, thetas=thetas,
             start=start, rows=rows)
-        params = {k: v for k, v in q14.items() if k != 'q'}
-
-        sc, results = self.execute_query(
-            q=q14['q'], col_name=corpus_col, **params)
+        sc, results = self.execute_cached_query(
+            key=(corpus_col, tuple(q14.items())), q=q14, col_name=corpus_col)
 
         if sc != 200:
             self.logger.error(
                 f"-- -- Error executing query Q14. Aborting operation...")
             return
 
-        # 6. Normalize scores
-        for el in results.docs:
-            el['score'] *= (100/(self.thetas_max_sum ^ 2))
+        # 6. Normalize scores (on copies, since the results may be shared through the results cache)
+        docs = [{**el, 'score': el['score'] * (100/(self.thetas_max_sum ^ 2))}
+                for el in results.docs]
 
-        return results.docs, sc
+        return docs, sc
 
     def do_Q15(self,
                corpus_col: str,
@@ -1682,10 +1792,8 @@ class EWBSolrClient(SolrClient):
 
         # 2. Execute query
         q15 = self.querier.customize_Q15(id=doc_id)
-        params = {k: v for k, v in q15.items() if k != 'q'}
-
         sc, results = self.execute_query(
-            q=q15['q'], col_name=corpus_col, **params)
+            col_name=corpus_col, **q15)
 
         if sc != 200:
             self.logger.error(
@@ -1697,8 +1805,8 @@ class EWBSolrClient(SolrClient):
     def do_Q16(self,
                corpus_col: str,
                model_name: str,
-               start: str,
-               rows: str) -> Union[dict, int]:
+               start: int,
+               rows: int) -> Union[dict, int]:
         """Executes query Q16.
 
         Parameters
@@ -1707,9 +1815,9 @@ class EWBSolrClient(SolrClient):
             Name of the corpus collection.
         model_name : str
             Name of the model to be used for the retrieval of the document-topic distributions
-        start: str
+        start: int
             Offset into the responses at which Solr should begin displaying content
-        rows: str
+        rows: int
             How many rows of responses are displayed at a time
 
         Returns
@@ -1740,10 +1848,8 @@ class EWBSolrClient(SolrClient):
                                          start=start, rows=rows)
         self.logger.info(
             f"-- -- Query Q16: {q16}")
-        params = {k: v for k, v in q16.items() if k != 'q'}
-
         sc, results = self.execute_query(
-            q=q16['q'], col_name=corpus_col, **params)
+            col_name=corpus_col, **q16)
 
         if sc != 200:
             self.logger.error(
@@ -1774,10 +1880,8 @@ class EWBSolrClient(SolrClient):
 
         # 2. Execute query
         q17 = self.querier.customize_Q17(topic_id=tpc_id, word=word)
-        params = {k: v for k, v in q17.items() if k != 'q'}
-
         sc, results = self.execute_query(
-            q=q17['q'], col_name=model_name, **params)
+            col_name=model_name, **q17)
 
         if sc != 200:
             self.logger.error(
@@ -1793,8 +1897,8 @@ class EWBSolrClient(SolrClient):
                corpus_col: str,
                ids: str,
                words: str,
-               start: str,
-               rows: str
+               start: int,
+               rows: int
                ) -> Union[dict, int]:
 
         # 0. Convert corpus name to lowercase
@@ -1811,10 +1915,8 @@ class EWBSolrClient(SolrClient):
             words=words.split(","),
             start=start,
             rows=rows)
-        params = {k: v for k, v in q18.items() if k != 'q'}
-
         sc, results = self.execute_query(
-            q=q18['q'], col_name=corpus_col, **params)
+            col_name=corpus_col, **q18)
 
         if sc != 200:
             self.logger.error(
@@ -1825,8 +1927,8 @@ class EWBSolrClient(SolrClient):
 
     def do_Q19(self,
                model_col: str,
-               start: str,
-               rows: str,
+               start: int,
+               rows: int,
                user: str) -> Union[dict, int]:
         """Executes query Q10.
 
@@ -1834,9 +1936,9 @@ class EWBSolrClient(SolrClient):
         ----------
         model_col: str
             Name of the model collection whose information is being retrieved
-        start: str
+        start: int
             Index of the first document to be retrieved
-        rows: str
+        rows: int
             Number of documents to be retrieved
         user: str
             User whose relevant topics are being retrieved
@@ -1862,10 +1964,8 @@ class EWBSolrClient(SolrClient):
         # 4. Execute query
         q19 = self.querier.customize_Q19(
             start=start, rows=rows, user=user)
-        params = {k: v for k, v in q19.items() if k != 'q'}
-
         sc, results = self.execute_query(
-            q=q19['q'], col_name=model_col, **params)
+            col_name=model_col, **q19)
 
         if sc != 200:
             self.logger.error(
@@ -2,6 +2,8 @@ import logging
 import os
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class Client(object):
@@ -19,6 +21,19 @@ class Client(object):
             import logging
             logging.basicConfig(level='DEBUG')
             self.logger = logging.getLogger('Inferencer')
+
+        # All requests go through a session so that connections to the API are pooled and reused across calls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(total=3,
+                              backoff_factor=0.5,
+                              status_forcelist=[502, 503, 504],
+                              raise_on_status=False))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
         return
     
     def _do_request(self,
@@ -47,14 +62,14 @@ class Client(object):
 
         # Send request
         if type == "get":
-            resp = requests.get(
+            resp = self.session.get(
                 url=url,
                 timeout=timeout,
                 **params
             )
             pass
         elif type == "post":
-            resp = requests.post(
+            resp = self.session.post(
                 url=url,
                 timeout=timeout,
                 **params
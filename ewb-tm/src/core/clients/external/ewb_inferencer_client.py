@@ -46,9 +46,6 @@ class EWBInferencerClient(Client):
         # Get the Inferencer URL from the environment variables
         self.inferencer_url = os.environ.get('INFERENCE_URL')
 
-        # Initialize requests session and logger
-        self.inferencer = requests.Session()
-        
         return
 
     def _do_request(self,
@@ -6,14 +6,14 @@ Date: 27/03/2023
 """
 
 import configparser
-import json
 from typing import List
 from gensim.corpora import Dictionary
 import pathlib
 import dask.dataframe as dd
+import pandas as pd
+import pyarrow.parquet as pq
 from dask.diagnostics import ProgressBar
-from src.core.entities.utils import (convert_datetime_to_strftime,
-                                     parseTimeINSTANT)
+from src.core.entities.utils import concat_fields, convert_datetime_to_instant
 
 
 class Corpus(object):
@@ -84,6 +84,53 @@ class Corpus(object):
 
         return
 
+    def _read_raw(self, columns: List[str] = None) -> pd.DataFrame:
+        """Reads the parquet file(s) associated to the logical corpus into a pandas dataframe, with datetime columns converted to the format required by Solr, missing values filled with empty strings and the id, title and date fields renamed.
+
+        If the raw corpus is a directory with several parquet shards, Dask is used with the threaded scheduler; otherwise, the file is read with PyArrow directly, avoiding the process pool overhead.
+
+        Parameters
+        ----------
+        columns: List[str]
+            Columns to read, given by their names after renaming (i.e., 'id', 'title' and 'date' for the id, title and date fields). If None, all columns are read.
+
+        Returns:
+        --------
+        df: pd.DataFrame
+            Dataframe with the raw corpus information.
+        """
+
+        renames = {self.id_field: "id",
+                   self.title_field: "title",
+                   self.date_field: "date"}
+
+        if columns is not None:
+            # Only the requested columns are read from disk
+            raw_names = {v: k for k, v in renames.items()}
+            columns = list(dict.fromkeys(
+                raw_names.get(col, col) for col in columns))
+
+        shards = list(self.path_to_raw.glob("*.parquet")) \
+            if self.path_to_raw.is_dir() else [self.path_to_raw]
+
+        if len(shards) > 1:
+            ddf = dd.read_parquet(
+                self.path_to_raw, columns=columns, engine="pyarrow")
+            with ProgressBar():
+                df = ddf.compute(scheduler='threads')
+        else:
+            df = pq.read_table(
+                self.path_to_raw, columns=columns).to_pandas(self_destruct=True)
+
+        # Convert dates information to the format required by Solr ( ISO_INSTANT, The ISO instant formatter that formats or parses an instant in UTC, such as '2011-12-03T10:15:30Z'). This must happen before filling missing values, since filling a datetime column that has missing values turns it into an object column of pd.Timestamp values, which are neither converted nor serializable
+        df, _ = convert_datetime_to_instant(df)
+        df = df.fillna("")
+
+        # Rename id-field to id, title-field to title and date-field to date
+        df = df.rename(columns=renames)
+
+        return df
+
     def get_docs_raw_info(self) -> List[dict]:
         """Extracts the information contained in the parquet file associated to the logical corpus and transforms into a list of dictionaries.
 
@@ -92,8 +139,7 @@ class Corpus(object):
         json_lst: list[dict]
             A list of dictionaries containing information about the corpus.
         """
-        ddf = dd.read_parquet(self.path_to_raw).fillna("")
-        self._logger.info(ddf.head())
+        df = self._read_raw()
 
         # If the id_field is in the SearcheableField, remove it and add the id field (new name for the id_field)
         if self.id_field in self.sercheable_field:
@@ -101,15 +147,6 @@ class Corpus(object):
             self.sercheable_field.append("id")
         self._logger.info(f"SearcheableField {self.sercheable_field}")
 
-        # Rename id-field to id, title-field to title and date-field to date
-        ddf = ddf.rename(
-            columns={
-                self.id_field: "id",
-                self.title_field: "title",
-                self.date_field: "date"})
-
-        with ProgressBar():
-            df = ddf.compute(scheduler='processes')
         self._logger.info(f"this is the df: {df.head()}")
         self._logger.info(f"this is the df columns: {df.columns}")
         # Get number of words per document based on the lemmas column
@@ -131,19 +168,14 @@ class Corpus(object):
         df['bow'] = df['bow'].apply(lambda x: ' '.join(
             [f'{word}|{count}' for word, count in x]).rstrip() if x else None)
 
-        # Convert dates information to the format required by Solr ( ISO_INSTANT, The ISO instant formatter that formats or parses an instant in UTC, such as '2011-12-03T10:15:30Z')
-        df, cols = convert_datetime_to_strftime(df)
-        df[cols] = df[cols].applymap(parseTimeINSTANT)
-
         # Create SearcheableField by concatenating all the fields that are marked as SearcheableField in the config file
-        df['SearcheableField'] = df[self.sercheable_field].apply(
-            lambda x: ' '.join(x.astype(str)), axis=1)
+        df['SearcheableField'] = concat_fields(df, self.sercheable_field)
 
         # Save corpus fields
         self.fields = df.columns.tolist()
 
-        json_str = df.to_json(orient='records')
-        json_lst = json.loads(json_str)
+        # Build the records directly from the dataframe, without materializing an intermediate JSON string
+        json_lst = df.to_dict(orient='records')
 
         return json_lst
 
@@ -182,17 +214,6 @@ class Corpus(object):
         action: str
     ):
 
-        ddf = dd.read_parquet(self.path_to_raw).fillna("")
-
-        # Rename id-field to id, title-field to title and date-field to date
-        ddf = ddf.rename(
-            columns={self.id_field: "id",
-                     self.title_field: "title",
-                     self.date_field: "date"})
-
-        with ProgressBar():
-            df = ddf.compute(scheduler='processes')
-
         if action == "add":
             new_SearcheableFields = [
                 el for el in new_SearcheableFields if el not in self.sercheable_field]
@@ -214,21 +235,13 @@ class Corpus(object):
             new_SearcheableFields = [
                 el for el in self.sercheable_field if el not in new_SearcheableFields]
 
-        df['SearcheableField'] = df[new_SearcheableFields].apply(
-            lambda x: ' '.join(x.astype(str)), axis=1)
-
-        not_keeps_cols = [el for el in df.columns.tolist() if el not in [
-            "id", "SearcheableField"]]
-        df = df.drop(not_keeps_cols, axis=1)
-
-        # Create json from dataframe
-        json_str = df.to_json(orient='records')
-        json_lst = json.loads(json_str)
+        # Only the id and the fields that make up the new SearcheableField are needed
+        df = self._read_raw(columns=["id"] + new_SearcheableFields)
+        df['SearcheableField'] = concat_fields(df, new_SearcheableFields)
 
-        new_list = []
-        for d in json_lst:
-            d["SearcheableField"] = {"set": d["SearcheableField"]}
-            new_list.append(d)
+        # Create the update in the format required by Solr directly from the only two columns involved
+        new_list = [{"id": id_, "SearcheableField": {"set": field}}
+                    for id_, field in zip(df["id"].tolist(), df["SearcheableField"].tolist())]
 
         return new_list, new_SearcheableFields
 
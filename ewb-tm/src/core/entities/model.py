@@ -11,19 +11,41 @@ Date: 27/03/2023
 
 
 import configparser
-import json
 import os
 import pathlib
-from typing import List
+from typing import Iterator, List, Tuple
 
-import dask.dataframe as dd
 import numpy as np
+import orjson
 import pandas as pd
-from dask.diagnostics import ProgressBar
+import pyarrow.parquet as pq
+import scipy.sparse as sparse
 from src.core.entities.tm_model import TMmodel
 # from tm_model import TMmodel
-from src.core.entities.utils import sum_up_to
-# from utils import sum_up_to
+from src.core.entities.utils import sum_up_to, sum_up_to_sparse
+# from utils import sum_up_to, sum_up_to_sparse
+
+
+def get_doc_str_rpr(thetas: sparse.csr_matrix) -> List[str]:
+    """Calculates the string representation of the topic proportions of each document (row) of a CSR matrix in the format 't0|100 t1|200 ...'. Only the nonzero entries of each row are visited.
+
+    Parameters
+    ----------
+    thetas: sparse.csr_matrix
+        CSR matrix with the (integer) topic proportions of the documents.
+
+    Returns
+    -------
+    rpr: List[str]
+        String representation of each document's topic proportions.
+    """
+    # Topic tokens are built once per call and reused for every document
+    topic_tokens = [f"t{k}|" for k in range(thetas.shape[1])]
+    indptr = thetas.indptr.tolist()
+    indices = thetas.indices.tolist()
+    data = thetas.data.tolist()
+    return [" ".join([topic_tokens[idx] + str(val) for idx, val in zip(indices[start:end], data[start:end]) if val != 0])
+            for start, end in zip(indptr[:-1], indptr[1:])]
 
 
 class Model(object):
@@ -59,9 +81,14 @@ class Model(object):
                 '-- -- The provided model path does not exist.')
         self.path_to_model = path_to_model
 
-        # Get model and corpus names
+        # Read training configuration ('trainconfig.json') once, and get model and corpus names from it
+        self.tr_config = orjson.loads(
+            self.path_to_model.joinpath("trainconfig.json").read_bytes())
         self.name = path_to_model.stem.lower()
-        self.corpus_name = None
+        self.corpus = self.tr_config["TrDtSet"]
+        self.corpus_name = pathlib.Path(self.corpus).name
+        if self.corpus_name.endswith(".parquet") or self.corpus_name.endswith(".json"):
+            self.corpus_name = self.corpus_name.split(".")[0].lower()
 
         # Read configuration from config file
         cf = configparser.ConfigParser()
@@ -76,11 +103,18 @@ class Model(object):
         # self.betas_max_sum = 10000
 
         # Get model information from TMmodel
+        # NOTE: The TMmodel files are only loaded when needed, and thetas is cached (in CSR format) across calls
         self.tmmodel = TMmodel(self.path_to_model.joinpath("TMmodel"))
-        self.alphas, self.betas, self.thetas, self.vocab, self.sims, self.coords = self.tmmodel.get_model_info_for_vis()
+        self._thetas = None
 
         return
 
+    def _get_thetas(self):
+        """Returns the document-topic proportions of the model as a CSR matrix, loading them from disk only the first time."""
+        if self._thetas is None:
+            self._thetas = self.tmmodel.get_thetas()
+        return self._thetas
+
     def get_model_info(self) -> List[dict]:
         """It retrieves the information about a topic model as a list of dictionaries.
 
@@ -90,15 +124,10 @@ class Model(object):
             A list of dictionaries containing information about the topic model.
         """
 
-        # Read training config ('trainconfig.json')
-        tr_config = self.path_to_model.joinpath("trainconfig.json")
-        with pathlib.Path(tr_config).open('r', encoding='utf8') as fin:
-            tr_config = json.load(fin)
-
         # Get model information as dataframe, where each row is a topic
-        df, vocab_id2w, vocab = self.tmmodel.to_dataframe()
-        df = df.apply(pd.Series.explode)
-        df.reset_index(drop=True)
+        df, _, vocab = self.tmmodel.to_dataframe()
+        # Explode the single-row dataframe (one list/array per column, with one element per topic) by building the columns directly
+        df = pd.DataFrame({col: list(df.at[0, col]) for col in df.columns})
         df["id"] = [f"t{i}" for i in range(len(df))]
 
         cols = df.columns.tolist()
@@ -115,22 +144,23 @@ class Model(object):
             lambda x: get_betas_scale(x, self.betas_max_sum))
 
         # Get words in each topic
+        # NOTE: vocab is the list of words ordered by id, so it is indexed by position instead of going through vocab_id2w's string keys
         def get_tp_words(vector: np.array,
-                         vocab_id2w: dict) -> str:
-            return ", ".join([vocab_id2w[str(idx)] for idx, val in enumerate(vector) if val != 0])
+                         vocab: list) -> str:
+            return ", ".join([vocab[idx] for idx in np.flatnonzero(vector).tolist()])
 
         df["vocab"] = df["betas"].apply(
-            lambda x: get_tp_words(x, vocab_id2w))
+            lambda x: get_tp_words(x, vocab))
 
         # Get betas string representation
         def get_tp_str_rpr(vector: np.array,
-                           vocab_id2w: dict) -> str:
-            rpr = " ".join([f"{vocab_id2w[str(idx)]}|{val}" for idx,
-                           val in enumerate(vector) if val != 0]).rstrip()
-            return rpr
+                           vocab: list) -> str:
+            idxs = np.flatnonzero(vector)
+            return " ".join(f"{vocab[idx]}|{val}" for idx,
+                            val in zip(idxs.tolist(), vector[idxs].tolist()))
 
         df["betas"] = df["betas_scale"].apply(
-            lambda x: get_tp_str_rpr(x, vocab_id2w))
+            lambda x: get_tp_str_rpr(x, vocab))
 
         def get_top_words_betas(row, vocab, n_words=15):
             # a row is a topic
@@ -141,10 +171,7 @@ class Model(object):
             value0 = word_tfidf_dict[list(word_tfidf_dict.keys())[0]]
             word_tfidf_dict = {word: round((val/value0)*100, 3)
                                for word, val in word_tfidf_dict.items()}
-            rpr = " ".join(
-                [f"{word}|{word_tfidf_dict[word]}" for word in word_tfidf_dict.keys()]).rstrip()
-
-            return rpr
+            return " ".join(f"{word}|{val}" for word, val in word_tfidf_dict.items())
 
         df['top_words_betas'] = df.apply(
             lambda row: get_top_words_betas(row, vocab), axis=1)
@@ -153,14 +180,14 @@ class Model(object):
         df = df.drop(columns=["betas_scale", "betas_ds"])
 
         # Get topic coordinates in cluster space
-        df["coords"] = self.coords
+        df["coords"] = self.tmmodel.get_tpc_coords()
 
-        json_str = df.to_json(orient='records')
-        json_lst = json.loads(json_str)
+        # Build the records directly from the dataframe, without materializing an intermediate JSON string
+        json_lst = df.to_dict(orient='records')
 
         return json_lst
 
-    def get_model_info_update(self, action: str) -> List[dict]:
+    def get_model_info_update(self, action: str) -> Tuple[Iterator[dict], str]:
         """
         Retrieves the information from the model that goes to a corpus collection (document-topic proportions) and save it as an update in the format required by Solr.
 
@@ -171,73 +198,41 @@ class Model(object):
 
         Returns:
         --------
-        json_lst: list[dict]
-            A list of dictionaries with thr document-topic proportions update.
+        new_list: Iterator[dict]
+            A generator of dictionaries with the document-topic proportions update, so that the update of each document is only built when it is consumed (e.g., by SolrClient.index_documents).
+        corpus_name: str
+            Name of the corpus collection the update refers to.
         """
 
-        # Read training configuration
-        tr_config = self.path_to_model.joinpath("trainconfig.json")
-        with pathlib.Path(tr_config).open('r', encoding='utf8') as fin:
-            tr_config = json.load(fin)
-
-        # Get corpus path and name of the collection
-        self.corpus = tr_config["TrDtSet"]
-        self.corpus_name = pathlib.Path(tr_config["TrDtSet"]).name
-        if self.corpus_name.endswith(".parquet") or self.corpus_name.endswith(".json"):
-            self.corpus_name = self.corpus_name.split(".")[0].lower()
-
         # Keys for dodument-topic proportions and similarity that will be used within the corpus collection
         model_key = 'doctpc_' + self.name
         sim_model_key = 'sim_' + self.name
 
         # Get ids of documents kept in the tr corpus
-        if tr_config["trainer"].lower() == "mallet":
+        if self.tr_config["trainer"].lower() == "mallet":
             def process_line(line):
-                id_ = line.rsplit(' 0 ')[0].strip()
+                id_ = line.partition(' 0 ')[0].strip()
                 id_ = int(id_.strip('"'))
                 return id_
             with open(self.path_to_model.joinpath("corpus.txt"), encoding="utf-8") as file:
                 ids_corpus = [process_line(line) for line in file]
-        elif tr_config["trainer"].lower() == "prodlda" or \
-                tr_config["trainer"].lower() == "ctm":
-            ddf = dd.read_parquet(
-                self.path_to_model.joinpath("corpus.parquet"))
-            with ProgressBar():
-                ids_corpus = ddf["id"].compute(scheduler='processes')
+        elif self.tr_config["trainer"].lower() == "prodlda" or \
+                self.tr_config["trainer"].lower() == "ctm":
+            # Only the id column is read, and converted straight from Arrow to a list
+            ids_corpus = pq.read_table(
+                self.path_to_model.joinpath("corpus.parquet"),
+                columns=["id"]).column("id").to_pylist()
         else:
             self._logger.error(
                 '-- -- The trainer used to train the model is not supported.')
 
         # Actual topic model's information only needs to be retrieved if action is "set"
         if action == "set":
-            # Get doc-topic representation
-            def get_doc_str_rpr(vector, max_sum):
-                """Calculates the string representation of a document's topic proportions in the format 't0|100 t1|200 ...', so that the sum of the topic proportions is at most max_sum.
-
-                Parameters
-                ----------
-                vector: numpy.array
-                    Array with the topic proportions of a document.
-                max_sum: int
-                    Maximum sum of the topic proportions.
-
-                Returns 
-                -------
-                rpr: str
-                    String representation of the document's topic proportions.
-                """
-                vector = sum_up_to(vector, max_sum)
-                rpr = ""
-                for idx, val in enumerate(vector):
-                    if val != 0:
-                        rpr += "t" + str(idx) + "|" + str(val) + " "
-                rpr = rpr.rstrip()
-                return rpr
-
+            # Get doc-topic representation, in the format 't0|100 t1|200 ...', so that the sum of the topic proportions of each document is at most max_sum
             self._logger.info("Attaining thetas rpr...")
-            thetas_dense = self.thetas.todense()
-            doc_tpc_rpr = [get_doc_str_rpr(thetas_dense[row, :], self.thetas_max_sum)
-                           for row in range(len(thetas_dense))]
+            thetas_int = sum_up_to_sparse(
+                self._get_thetas(), self.thetas_max_sum)
+            doc_tpc_rpr = get_doc_str_rpr(thetas_int)
 
             # Get similarities string representation
             self._logger.info("Attaining sims rpr...")
@@ -245,41 +240,15 @@ class Model(object):
             with open(self.path_to_model.joinpath("TMmodel").joinpath('distances.txt'), 'r') as f:
                 sim_rpr = [line.strip() for line in f]
             self._logger.info(
-                "Thetas and sims attained. Creating dataframe...")
-
-            # Save the information in a dataframe
-            df = pd.DataFrame(list(zip(ids_corpus, doc_tpc_rpr, sim_rpr)),
-                              columns=['id', model_key, sim_model_key])
-            self._logger.info(
-                f"Dataframe created. Printing columns:{df.columns.tolist()}")
-
-        elif action == "remove":
-            doc_tpc_rpr = ["" for _ in range(len(ids_corpus))]
-            sim_rpr = doc_tpc_rpr
-            # Save the information in a dataframe
-            df = pd.DataFrame(list(zip(ids_corpus, doc_tpc_rpr, sim_rpr)),
-                              columns=['id', model_key, sim_model_key])
-
-        # Create json from dataframe
-        json_str = df.to_json(orient='records')
-        json_lst = json.loads(json_str)
+                "Thetas and sims attained. Creating update...")
 
-        # Updating json in the format required by Solr
-        new_list = []
+        # Build the update in the format required by Solr directly from the ids and representations, lazily
         if action == 'set':
-            for d in json_lst:
-                tpc_dict = {'set': d[model_key]}
-                d[model_key] = tpc_dict
-                sim_dict = {'set': d[sim_model_key]}
-                d[sim_model_key] = sim_dict
-                new_list.append(d)
+            new_list = ({"id": id_, model_key: {'set': tpc}, sim_model_key: {'set': sim}}
+                        for id_, tpc, sim in zip(ids_corpus, doc_tpc_rpr, sim_rpr))
         elif action == 'remove':
-            for d in json_lst:
-                tpc_dict = {'set': []}
-                d[model_key] = tpc_dict
-                sim_dict = {'set': []}
-                d[sim_model_key] = sim_dict
-                new_list.append(d)
+            new_list = ({"id": id_, model_key: {'set': []}, sim_model_key: {'set': []}}
+                        for id_ in ids_corpus)
 
         return new_list, self.corpus_name
 
@@ -10,6 +10,7 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 import scipy.sparse as sparse
+from scipy.special import rel_entr
 from sparse_dot_topn import awesome_cossim_topn
 
 
@@ -136,7 +137,7 @@ class TMmodel(object):
         self._sort_topics()
         self._calculate_beta_ds()
         self._calculate_topic_entropy()
-        self._ndocs_active = np.array((self._thetas != 0).sum(0).tolist()[0])
+        self._ndocs_active = (self._thetas != 0).getnnz(axis=0)
         self._tpc_descriptions = [el[1]
                                   for el in self.get_tpc_word_descriptions()]
         self.calculate_topic_coherence()  # cohrs_aux
@@ -190,7 +191,7 @@ class TMmodel(object):
         # removed for these problematic documents). We need to take this into
         # account
         ndocs = 10000
-        validDocs = np.sum(self._thetas.toarray(), axis=1) > 0
+        validDocs = np.asarray(self._thetas.sum(axis=1)).ravel() > 0
         nValidDocs = np.sum(validDocs)
         if ndocs > nValidDocs:
             ndocs = nValidDocs
@@ -299,7 +300,7 @@ class TMmodel(object):
     def _load_thetas(self):
         if self._thetas is None:
             self._thetas = sparse.load_npz(
-                self._TMfolder.joinpath('thetas.npz'))
+                self._TMfolder.joinpath('thetas.npz')).tocsr()
             self._ntopics = self._thetas.shape[1]
             # self._ndocs_active = np.array((self._thetas != 0).sum(0).tolist()[0])
 
@@ -386,8 +387,8 @@ class TMmodel(object):
         else:
             corpusFile = self._TMfolder.parent.joinpath('corpus.txt')
         with corpusFile.open("r", encoding="utf-8") as f:
-            corpus = [line.rsplit(" 0 ")[1].strip().split() for line in f.readlines(
-            ) if line.rsplit(" 0 ")[1].strip().split() != []]
+            corpus = [words for line in f
+                      if (words := line.split(" 0 ", 2)[1].split())]
 
         # Import necessary modules for coherence calculation with Gensim
         # TODO: This needs to be substituted by a non-Gensim based calculation of the coherence
@@ -446,7 +447,9 @@ class TMmodel(object):
     def _calculate_sims(self, topn=50, lb=0):
         if self._thetas is None:
             self._load_thetas()
-        thetas_sqrt = np.sqrt(self._thetas)
+        # Square root on the stored nonzeros only; the transpose of a CSR
+        # matrix is a CSC view over the same buffers, so no copy is made
+        thetas_sqrt = self._thetas.tocsr().sqrt()
         thetas_col = thetas_sqrt.T
         self._sims = awesome_cossim_topn(thetas_sqrt, thetas_col, topn, lb)
 
@@ -469,6 +472,27 @@ class TMmodel(object):
                 selected_idx.append((id0, id1, ary[id0, id1]))
         return selected_idx
 
+    def _js_distances(self, P, Q, max_elements=2**24):
+        """Returns the matrix of Jensen-Shannon distances between the rows of P and the rows of Q. It is equivalent to calling scipy's jensenshannon for every pair of rows, but computed with NumPy broadcasting and the rel_entr ufunc, in blocks of rows of P so that the intermediate arrays have at most max_elements elements. If P and Q are the same array, only the upper triangle is computed and then mirrored."""
+        symmetric = P is Q
+        P = P / P.sum(axis=1, keepdims=True)
+        Q = P if symmetric else Q / Q.sum(axis=1, keepdims=True)
+        js_mat = np.empty((P.shape[0], Q.shape[0]))
+        block = max(1, max_elements // max(1, Q.size))
+        for start in range(0, P.shape[0], block):
+            cols = slice(start if symmetric else 0, None)
+            p = P[start:start + block, np.newaxis, :]
+            q = Q[np.newaxis, cols, :]
+            m = p + q
+            m *= 0.5
+            js = rel_entr(p, m).sum(axis=-1)
+            js += rel_entr(q, m).sum(axis=-1)
+            js *= 0.5
+            js_mat[start:start + block, cols] = np.sqrt(np.maximum(js, 0))
+        if symmetric:
+            js_mat = np.triu(js_mat) + np.triu(js_mat, 1).T
+        return js_mat
+
     def get_model_info_for_hierarchical(self):
         """Returns the objects necessary for the creation of a level-2 topic model.
         """
@@ -594,6 +618,14 @@ class TMmodel(object):
         self._load_alphas()
         return self._alphas
 
+    def get_thetas(self):
+        self._load_thetas()
+        return self._thetas
+
+    def get_tpc_coords(self):
+        self.load_tpc_coords()
+        return self._coords
+
     def showTopics(self):
         self._load_alphas()
         self._load_ndocs_active()
@@ -651,7 +683,7 @@ class TMmodel(object):
             self._thetas = self._thetas[:, tpc_keep]
             from sklearn.preprocessing import normalize
             self._thetas = normalize(self._thetas, axis=1, norm='l1')
-            self._alphas = np.asarray(np.mean(self._thetas, axis=0)).ravel()
+            self._alphas = np.asarray(self._thetas.mean(axis=0)).ravel()
             self._ntopics = self._thetas.shape[1]
             self._betas = self._betas[tpc_keep, :]
             self._betas_ds = self._betas_ds[tpc_keep, :]
@@ -686,10 +718,10 @@ class TMmodel(object):
         # Part 1 - Coocurring topics
         # Highly correlated topics co-occure together
         # Topic mean
-        med = np.asarray(np.mean(self._thetas, axis=0)).ravel()
+        med = np.asarray(self._thetas.mean(axis=0)).ravel()
         # Topic square mean
         thetas2 = self._thetas.multiply(self._thetas)
-        med2 = np.asarray(np.mean(thetas2, axis=0)).ravel()
+        med2 = np.asarray(thetas2.mean(axis=0)).ravel()
         # Topic stds
         stds = np.sqrt(med2 - med ** 2)
         # Topic correlation
@@ -705,18 +737,13 @@ class TMmodel(object):
 
         # Part 2 - Topics with similar word composition
         # Computes inter-topic distance based on word distributions
-        # using scipy implementation of Jensen Shannon distance
-        from scipy.spatial.distance import jensenshannon
+        # using Jensen Shannon distance
 
         # For a more efficient computation with very large vocabularies
         # we implement a threshold for restricting the distance calculation
         # to columns where any element is greater than threshold thr
         betas_aux = self._betas[:, np.where(self._betas.max(axis=0) > thr)[0]]
-        js_mat = np.zeros((self._ntopics, self._ntopics))
-        for k in range(self._ntopics):
-            for kk in range(self._ntopics):
-                js_mat[k, kk] = jensenshannon(
-                    betas_aux[k, :], betas_aux[kk, :])
+        js_mat = self._js_distances(betas_aux, betas_aux)
         JSsim = 1 - js_mat
         selected_worddesc = self._largest_indices(
             JSsim, self._ntopics + 2 * npairs)
@@ -754,22 +781,25 @@ class TMmodel(object):
             # keep new topic vector in upper position and delete the others
             self._betas[tpcs[0], :] = bet
             self._betas = np.delete(self._betas, tpcs[1:], 0)
-            # For theta we need to keep the sum. Since adding implies changing
-            # structure, we need to convert to full matrix first
+            # For theta we need to keep the sum. The fused columns are added
+            # into the upper one and the others deleted by multiplying by a
+            # sparse 0/1 topic mapping matrix, so thetas is never densified
             # No need to renormalize
-            thetas_full = self._thetas.toarray()
-            thet = np.sum(thetas_full[:, tpcs], axis=1)
-            thetas_full[:, tpcs[0]] = thet
-            thetas_full = np.delete(thetas_full, tpcs[1:], 1)
-            self._thetas = sparse.csr_matrix(thetas_full, copy=True)
+            tpc_keep = [k for k in range(self._ntopics) if k not in tpcs[1:]]
+            new_pos = {k: pos for pos, k in enumerate(tpc_keep)}
+            mapping = [new_pos.get(k, new_pos[tpcs[0]])
+                       for k in range(self._ntopics)]
+            merge = sparse.csr_matrix(
+                (np.ones(self._ntopics), (np.arange(self._ntopics), mapping)),
+                shape=(self._ntopics, len(tpc_keep)))
+            self._thetas = sparse.csr_matrix(self._thetas.dot(merge))
             # Compute new alphas and number of topics
-            self._alphas = np.asarray(np.mean(self._thetas, axis=0)).ravel()
+            self._alphas = np.asarray(self._thetas.mean(axis=0)).ravel()
             self._ntopics = self._thetas.shape[1]
             # Compute all other variables
             self._calculate_beta_ds()
             self._calculate_topic_entropy()
-            self._ndocs_active = np.array(
-                (self._thetas != 0).sum(0).tolist()[0])
+            self._ndocs_active = (self._thetas != 0).getnnz(axis=0)
 
             # Keep label and description of most significant topic
             for tpc in tpcs[1:][::-1]:
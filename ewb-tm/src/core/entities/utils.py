@@ -6,12 +6,10 @@ Date: 12/04/2023
 """
 
 
-import math
-import random
-from datetime import datetime
 
 import numpy as np
-import pytz
+import pandas as pd
+import scipy.sparse as sparse
 
 
 def is_valid_xml_char_ordinal(i):
@@ -38,38 +36,64 @@ def clean_xml_string(s):
     return "".join(c for c in s if is_valid_xml_char_ordinal(ord(c)))
 
 
-def convert_datetime_to_strftime(df):
+def convert_datetime_to_instant(df):
     """
-    Converts all columns of type datetime64[ns] in a dataframe to strftime format.
+    Converts all datetime columns of a dataframe to the format required by Solr (ISO_INSTANT, e.g., '2011-12-03T10:15:30.000000Z'). The conversion is carried out column-wise with pandas' vectorized datetime accessors. Naive datetimes are assumed to be in UTC, and missing values are converted into empty strings.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        Dataframe whose datetime columns are to be converted.
+
+    Returns
+    -------
+    df: pd.DataFrame
+        Dataframe with the datetime columns converted.
+    columns: list
+        List of the converted columns.
     """
     columns = []
     for column in df.columns:
-        if df[column].dtype == "datetime64[ns]":
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
             columns.append(column)
-            df[column] = df[column].dt.strftime("%Y-%m-%d %H:%M:%S")
+            col = df[column].dt.floor("s")
+            if col.dt.tz is None:
+                col = col.dt.tz_localize("UTC")
+            else:
+                col = col.dt.tz_convert("UTC")
+            df[column] = col.dt.strftime(
+                "%Y-%m-%dT%H:%M:%S.%fZ").fillna("")
     return df, columns
 
 
-def parseTimeINSTANT(time):
+def concat_fields(df, fields):
     """
-    Parses a string representing an instant in time and returns it as an Instant object.
+    Concatenates, separated by a blank space, the string representation of the given columns of a dataframe. The concatenation is carried out column-wise with pandas' vectorized string methods, rather than row by row.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        Dataframe containing the columns to concatenate.
+    fields: list
+        List of the columns to concatenate.
+
+    Returns
+    -------
+    concat: pd.Series
+        Series with the concatenated columns.
     """
-    format_string = '%Y-%m-%d %H:%M:%S'
-    if isinstance(time, str) and time != "foo":
-        dt = datetime.strptime(time, format_string)
-        dt_utc = dt.astimezone(pytz.UTC)
-        return clean_xml_string(dt_utc.strftime('%Y-%m-%dT%H:%M:%S.%fZ'))
-    elif time == "foo":
-        return clean_xml_string("")
-    else:
-        if math.isnan(time):
-            return clean_xml_string("")
-        
+    if not fields:
+        return pd.Series("", index=df.index)
+
+    cols = df[fields].astype(str)
+    return cols.iloc[:, 0].str.cat([cols.iloc[:, i] for i in range(1, cols.shape[1])], sep=" ")
+
+
 def sum_up_to(
     vector: np.ndarray,
     max_sum: int
 ) -> np.ndarray:
-    """It takes in a vector and a max_sum value and returns a NumPy array with the same shape as vector but with the values adjusted such that their sum is equal to max_sum using integer values.
+    """It takes in a vector and a max_sum value and returns a NumPy array with the same shape as vector but with the values adjusted such that their sum is equal to max_sum using integer values. The missing units are assigned deterministically, by largest remainder, among the elements that are still nonzero after flooring (or among all the nonzero elements if none is).
 
     Parameters
     ----------
@@ -83,10 +107,77 @@ def sum_up_to(
     x: np.ndarray
         A NumPy array of the same shape as vector but with the values adjusted such that their sum is equal to max_sum.
     """
-    x = np.array(list(map(np.int_, vector*max_sum))).ravel()
-    pos_idx = list(np.where(x != 0)[0])
-    while np.sum(x) != max_sum:
-        idx = random.choice(pos_idx)
-        if x[idx] > 0:
-            x[idx] += 1
-    return x
\ No newline at end of file
+    scaled = np.asarray(vector, dtype=np.float64).ravel() * max_sum
+    x = np.floor(scaled).astype(np.int64)
+    # Only the elements that are still nonzero after flooring take part in the apportionment
+    pos_idx = np.flatnonzero(x)
+    if pos_idx.size == 0:
+        pos_idx = np.flatnonzero(scaled)
+    deficit = int(max_sum - x.sum())
+    if deficit > 0 and pos_idx.size > 0:
+        # Largest remainder (Hamilton) apportionment: the units missing to reach max_sum go to the elements with the largest fractional parts
+        q, r = divmod(deficit, pos_idx.size)
+        x[pos_idx] += q
+        if r:
+            frac = scaled[pos_idx] - np.floor(scaled[pos_idx])
+            x[pos_idx[np.argpartition(-frac, r - 1)[:r]]] += 1
+    return x
+
+
+def sum_up_to_sparse(
+    matrix: sparse.spmatrix,
+    max_sum: int
+) -> sparse.csr_matrix:
+    """Row-wise, vectorized version of sum_up_to for sparse matrices: it returns an integer CSR matrix in which each row is adjusted such that its sum is equal to max_sum, following the same largest remainder apportionment. As in sum_up_to, the missing units of each row only go to its entries that are still nonzero after flooring (or to all its nonzero entries if none is), and the matrix is never densified.
+
+    Parameters
+    ----------
+    matrix: sparse.spmatrix
+        The sparse matrix whose rows are to be adjusted.
+    max_sum: int
+        Number representing the maximum sum of the elements of each row.
+
+    Returns:
+    --------
+    x: sparse.csr_matrix
+        A CSR matrix of the same shape as matrix but with the rows adjusted such that their sum is equal to max_sum.
+    """
+    matrix = sparse.csr_matrix(matrix, dtype=np.float64, copy=True)
+    matrix.eliminate_zeros()
+    matrix.sort_indices()
+    nrows = matrix.shape[0]
+    nnz_per_row = np.diff(matrix.indptr)
+    row_of = np.repeat(np.arange(nrows), nnz_per_row)
+
+    # Scale and floor in place on the copied data buffer; counts are bounded by max_sum, so int32 is enough
+    frac = matrix.data
+    frac *= max_sum
+    x = np.floor(frac).astype(np.int32)
+    frac -= x
+    deficits = max_sum - np.bincount(row_of, weights=x, minlength=nrows)
+    deficits = np.maximum(deficits, 0).astype(np.int32)
+
+    # The entries that are still nonzero after flooring take part in the apportionment; rows in which none is fall back to all their nonzero entries
+    eligible = x > 0
+    eligible |= (np.bincount(row_of, weights=eligible, minlength=nrows) == 0)[row_of]
+    nelig_per_row = np.bincount(row_of, weights=eligible, minlength=nrows).astype(np.int32)
+
+    # Each row spreads its deficit evenly over its eligible entries, and the remainder goes to the ones with the largest fractional parts
+    q, r = np.divmod(deficits, np.maximum(nelig_per_row, 1))
+    x[eligible] += q[row_of[eligible]]
+
+    # Only the eligible entries of rows with a remainder need to be ranked, by decreasing fractional part within their row
+    sel = np.flatnonzero(eligible & (r[row_of] > 0))
+    if sel.size:
+        sel_rows = row_of[sel]
+        order = np.lexsort((-frac[sel], sel_rows))
+        sorted_rows = sel_rows[order]
+        rank = np.arange(order.size) - \
+            np.searchsorted(sorted_rows, sorted_rows, side='left')
+        winners = sel[order[rank < r[sorted_rows]]]
+        x[winners] += 1
+
+    x = sparse.csr_matrix((x, matrix.indices, matrix.indptr), shape=matrix.shape)
+    # Entries that were floored to zero and got no units are dropped
+    x.eliminate_zeros()
+    return x
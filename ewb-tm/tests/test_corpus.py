@@ -0,0 +1,37 @@
+"""
+Tests for the construction of the Solr records of a logical corpus.
+
+Run from the ewb-tm folder with: python -m pytest tests
+"""
+
+import orjson
+import pandas as pd
+from src.core.entities.corpus import Corpus
+
+CONFIG = """[test_corpus-config]
+id_field=doc_id
+title_field=doc_title
+date_field=doc_date
+EWBdisplayed=doc_id,doc_title,doc_date
+SearcheableField=doc_title,doc_date
+"""
+
+
+def test_get_docs_raw_info_with_missing_date(tmp_path):
+    config_file = tmp_path.joinpath("config.cf")
+    config_file.write_text(CONFIG)
+    path_to_raw = tmp_path.joinpath("test_corpus.parquet")
+    pd.DataFrame({
+        "doc_id": ["0", "1"],
+        "doc_title": ["first", "second"],
+        "doc_date": pd.to_datetime(["2011-12-03 10:15:30", None]),
+        "lemmas": ["topic model", "solr"],
+    }).to_parquet(path_to_raw)
+
+    corpus = Corpus(path_to_raw, config_file=config_file.as_posix())
+    json_lst = corpus.get_docs_raw_info()
+
+    assert [doc["date"] for doc in json_lst] == \
+        ["2011-12-03T10:15:30.000000Z", ""]
+    # The records must be serializable as they are sent to Solr
+    orjson.dumps(json_lst, option=orjson.OPT_SERIALIZE_NUMPY)